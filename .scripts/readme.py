@@ -4,31 +4,107 @@ Enhanced README and documentation viewer for dotfiles.
 Displays README, INSTALL, CONFIG, CHEATSHEET files and more.
 """
 
-import argparse
+import codecs
+import itertools
+import mmap
 import os
+import re
 import sys
 import subprocess
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from types import SimpleNamespace
+from typing import Iterable, Iterator, List, Optional, Union
 
-try:
-    import markdown
-    MARKDOWN_AVAILABLE = True
-except ImportError:
-    MARKDOWN_AVAILABLE = False
+# argparse, markdown and concurrent.futures are imported where they are used,
+# keeping them off the startup path of the common invocations
 
-# ANSI color codes for terminal output
+# ANSI SGR parameters for terminal output, combined into one sequence by csi()
 class Colors:
-    RESET = '\033[0m'
-    BOLD = '\033[1m'
-    RED = '\033[91m'
-    GREEN = '\033[92m'
-    YELLOW = '\033[93m'
-    BLUE = '\033[94m'
-    PURPLE = '\033[95m'
-    CYAN = '\033[96m'
+    RESET = (0,)
+    BOLD = (1,)
+    RED = (91,)
+    GREEN = (92,)
+    YELLOW = (93,)
+    BLUE = (94,)
+    PURPLE = (95,)
+    CYAN = (96,)
 
 
+def csi(*codes: int) -> bytes:
+    """Build a single SGR escape sequence from one or more parameters."""
+    return b'\033[' + ';'.join(map(str, codes)).encode('ascii') + b'm'
+
+
+RESET = csi(*Colors.RESET)
+
+
+# Line categories highlighted by format_terminal, tried in order on each line.
+# Whitespace is matched with [^\S\n] so that leading indentation never spans
+# into the previous line, and list markers need some text after them. The
+# carriage return of a CRLF line is given back from the end of the match, so
+# RESET never lands between it and the newline (less -R would show it as ^M).
+# The pattern works on UTF-8 bytes, so only ASCII whitespace and digits count.
+LINE_PATTERN = re.compile(
+    rb'^(?:'
+    rb'(?P<h1># .*)'
+    rb'|(?P<h2>## .*)'
+    rb'|(?P<h3>### .*)'
+    rb'|(?P<code>```.*)'
+    rb'|(?P<command>[^\S\n]*(?:\$|sudo).*)'
+    rb'|(?P<bullet>[^\S\n]*[-*+] .*\S.*)'
+    rb'|(?P<numbered>\d.*?\. .*)'
+    rb')(?:(?<!\r)$|(?=\r$))',
+    re.MULTILINE,
+)
+
+LINE_STYLES = {
+    'h1': csi(*Colors.BOLD, *Colors.YELLOW),
+    'h2': csi(*Colors.BOLD, *Colors.CYAN),
+    'h3': csi(*Colors.BOLD),
+    'code': csi(*Colors.PURPLE),
+    'command': csi(*Colors.GREEN),
+    'bullet': csi(*Colors.CYAN),
+    'numbered': csi(*Colors.CYAN),
+}
+
+# Line categories listed by get_aliases, matched on the stripped line: a
+# "# Section" comment (but not "##") or an "alias name=command" definition.
+# A command wrapped in matching quotes is captured without them, so quotes
+# of the other kind inside it are kept; an opening quote left unclosed on
+# the line (multi-line aliases) is dropped. A trailing comment is kept apart.
+ALIAS_LINE_PATTERN = re.compile(
+    r'^[^\S\n]*(?:'
+    r'# [^\S\n]*(?P<section>\S.*?)'
+    r'|alias (?P<name>[^=\n]*)='
+    r'(?P<quote>[\'"]?)(?P<command>.*?)(?:(?P=quote)|(?=[^\S\n]*$))'
+    r'(?P<comment>[^\S\n]+#.*?)?'
+    r')[^\S\n]*$',
+    re.MULTILINE,
+)
+
+# Sort position of documentation files by name, before any others
+DOC_PRIORITY = {
+    name: i
+    for i, name in enumerate(['README', 'INSTALL', 'QUICKSTART', 'SETUP', 'CONFIG', 'USAGE', 'CHEATSHEET'])
+}
+DOC_PRIORITY_DEFAULT = len(DOC_PRIORITY)
+
+# File header drawn by format_terminal
+RULE_STYLE = csi(*Colors.BOLD, *Colors.BLUE)
+TITLE_STYLE = csi(*Colors.BOLD, *Colors.GREEN)
+
+
+def _has_readme(directory: Path) -> bool:
+    """Check whether a directory contains a README, stopping at the first one."""
+    try:
+        with os.scandir(directory) as entries:
+            return any(entry.name.startswith('README') for entry in entries)
+    except OSError:
+        return False
+
+
+@lru_cache(maxsize=1)
 def find_dotfiles_dir() -> Path:
     """Find the dotfiles directory."""
     # Check environment variable first
@@ -44,7 +120,7 @@ def find_dotfiles_dir() -> Path:
     ]
     
     for candidate in candidates:
-        if candidate.exists() and any(candidate.glob('README*')):
+        if _has_readme(candidate):
             return candidate
     
     return Path.cwd()
@@ -52,87 +128,139 @@ def find_dotfiles_dir() -> Path:
 
 def find_doc_files(directory: Path) -> List[Path]:
     """Find documentation files in the directory."""
-    doc_patterns = [
-        'README*',
-        'INSTALL*',
-        'CONFIG*',
-        'CHEATSHEET*',
-        'USAGE*',
-        'QUICKSTART*',
-        'SETUP*',
-        'GETTING_STARTED*',
-    ]
+    doc_prefixes = (
+        'README',
+        'INSTALL',
+        'CONFIG',
+        'CHEATSHEET',
+        'USAGE',
+        'QUICKSTART',
+        'SETUP',
+        'GETTING_STARTED',
+    )
     
+    # Single directory pass instead of one glob sweep per pattern
     files = []
-    for pattern in doc_patterns:
-        files.extend(directory.glob(pattern))
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.startswith(doc_prefixes):
+                    files.append(directory / entry.name)
+    except OSError:
+        return []
     
     # Sort by priority and then alphabetically
-    priority_order = ['README', 'INSTALL', 'QUICKSTART', 'SETUP', 'CONFIG', 'USAGE', 'CHEATSHEET']
-    
-    def sort_key(file_path):
-        name = file_path.stem.upper()
-        if name in priority_order:
-            return (priority_order.index(name), file_path.name)
-        return (len(priority_order), file_path.name)
+    return sorted(files, key=lambda p: (DOC_PRIORITY.get(p.stem.upper(), DOC_PRIORITY_DEFAULT), p.name))
+
+
+# Files larger than this are memory-mapped instead of read into memory
+MMAP_THRESHOLD = 1 << 20
+
+# Content of a file as UTF-8: bytes, or a read-only mapping for large files
+FileContent = Union[bytes, mmap.mmap]
+
+
+def read_file_bytes(file_path: Path) -> FileContent:
+    """Read file content as UTF-8 encoded bytes."""
+    try:
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size > MMAP_THRESHOLD:
+                # Served from the page cache without copying it into the process
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                data = f.read()
+    except Exception as e:
+        return f"Error reading file: {e}".encode('utf-8')
     
-    return sorted(files, key=sort_key)
+    # ASCII and valid UTF-8 are used as read, anything else is taken as latin1
+    if not _is_utf8(data):
+        return str(data, 'latin1').encode('utf-8')
+    return data
 
 
 def read_file(file_path: Path) -> str:
     """Read file content with proper encoding handling."""
+    return str(read_file_bytes(file_path), 'utf-8')
+
+
+def _is_utf8(data: FileContent) -> bool:
+    """Check whether data is valid UTF-8, decoding large data a slice at a time."""
+    if isinstance(data, bytes) and data.isascii():
+        return True
+    
+    decoder = codecs.getincrementaldecoder('utf-8')()
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        with memoryview(data) as view:
+            for start in range(0, len(view), MMAP_THRESHOLD):
+                decoder.decode(view[start:start + MMAP_THRESHOLD])
+        decoder.decode(b'', True)
     except UnicodeDecodeError:
-        try:
-            with open(file_path, 'r', encoding='latin1') as f:
-                return f.read()
-        except Exception as e:
-            return f"Error reading file: {e}"
-    except Exception as e:
-        return f"Error reading file: {e}"
+        return False
+    return True
 
 
-def format_terminal(content: str, file_path: Path) -> str:
-    """Format content for terminal display with colors."""
-    output = []
+def write_styled(buf: bytearray, style: bytes, text: str):
+    """Append text wrapped in a style and RESET to a byte buffer, or plain without a style."""
+    if not style:
+        buf += text.encode('utf-8')
+        return
+    buf += style
+    buf += text.encode('utf-8')
+    buf += RESET
+
+
+def _make_line_styler():
+    """Build the replacement callback for LINE_PATTERN.
+    
+    The rule set is fixed, so styles are resolved once into a tuple indexed
+    by group number and bound as defaults along with RESET. Styling a line
+    then needs no global, attribute-chain or dict lookups.
+    """
+    styles = [b''] * (LINE_PATTERN.groups + 1)
+    for name, index in LINE_PATTERN.groupindex.items():
+        styles[index] = LINE_STYLES[name]
+    
+    def style_line(match: re.Match, styles=tuple(styles), reset=RESET) -> bytes:
+        """Wrap a line matched by LINE_PATTERN in the style for its category."""
+        return styles[match.lastindex] + match[0] + reset
+    
+    return style_line
+
+
+_style_line = _make_line_styler()
+
+
+def format_terminal(content: FileContent, file_path: Path) -> bytes:
+    """Format UTF-8 content for terminal display with colors."""
+    output = bytearray()
     
     # Header
-    output.append(f"{Colors.BOLD}{Colors.BLUE}{'='*60}{Colors.RESET}")
-    output.append(f"{Colors.BOLD}{Colors.GREEN}{file_path.name}{Colors.RESET}")
-    output.append(f"{Colors.BOLD}{Colors.BLUE}{'='*60}{Colors.RESET}")
-    output.append("")
-    
-    # Content with basic formatting
-    lines = content.split('\n')
-    for line in lines:
-        # Headers
-        if line.startswith('# '):
-            output.append(f"{Colors.BOLD}{Colors.YELLOW}{line}{Colors.RESET}")
-        elif line.startswith('## '):
-            output.append(f"{Colors.BOLD}{Colors.CYAN}{line}{Colors.RESET}")
-        elif line.startswith('### '):
-            output.append(f"{Colors.BOLD}{line}{Colors.RESET}")
-        # Code blocks
-        elif line.startswith('```'):
-            output.append(f"{Colors.PURPLE}{line}{Colors.RESET}")
-        elif line.strip().startswith('$') or line.strip().startswith('sudo'):
-            output.append(f"{Colors.GREEN}{line}{Colors.RESET}")
-        # Lists
-        elif line.strip().startswith(('- ', '* ', '+ ')):
-            output.append(f"{Colors.CYAN}{line}{Colors.RESET}")
-        elif line.strip() and line[0].isdigit() and '. ' in line:
-            output.append(f"{Colors.CYAN}{line}{Colors.RESET}")
-        else:
-            output.append(line)
+    write_styled(output, RULE_STYLE, '=' * 60)
+    output += b'\n'
+    write_styled(output, TITLE_STYLE, file_path.name)
+    output += b'\n'
+    write_styled(output, RULE_STYLE, '=' * 60)
+    output += b'\n\n'
     
-    return '\n'.join(output)
+    # Content with basic formatting, applied in a single regex pass
+    output += LINE_PATTERN.sub(_style_line, content)
+    return output
+
+
+@lru_cache(maxsize=1)
+def _load_markdown():
+    """Import the optional markdown package, or return None if it is missing."""
+    try:
+        import markdown
+    except ImportError:
+        return None
+    return markdown
 
 
 def format_html(content: str, file_path: Path) -> str:
     """Format content as HTML."""
-    if MARKDOWN_AVAILABLE and file_path.suffix.lower() in ['.md', '.markdown']:
+    markdown = _load_markdown()
+    if markdown and file_path.suffix.lower() in ['.md', '.markdown']:
         html_content = markdown.markdown(content, extensions=['codehilite', 'fenced_code'])
     else:
         # Simple HTML escaping and formatting
@@ -160,63 +288,155 @@ def format_html(content: str, file_path: Path) -> str:
 """
 
 
-def get_aliases() -> str:
-    """Extract aliases from bash_aliases file."""
+def get_aliases(output_format: str = 'terminal') -> bytes:
+    """Extract aliases from bash_aliases file, coloured only for terminal output."""
     dotfiles_dir = find_dotfiles_dir()
     aliases_file = dotfiles_dir / '.bash_aliases'
     
     if not aliases_file.exists():
-        return "No .bash_aliases file found."
+        return b"No .bash_aliases file found."
     
     content = read_file(aliases_file)
-    lines = content.split('\n')
     
-    output = []
-    output.append(f"{Colors.BOLD}{Colors.GREEN}Available Aliases:{Colors.RESET}")
-    output.append("")
+    if output_format == 'terminal':
+        title_style = csi(*Colors.BOLD, *Colors.GREEN)
+        section_style = csi(*Colors.BOLD, *Colors.YELLOW)
+        alias_style = csi(*Colors.CYAN)
+    else:
+        title_style = section_style = alias_style = b''
+    
+    # Every entry after the title starts with its own line break
+    output = bytearray()
+    write_styled(output, title_style, "Available Aliases:")
+    output += b'\n'
     
+    # Only section and alias lines are matched, everything else is skipped
     current_section = None
-    for line in lines:
-        line = line.strip()
+    for match in ALIAS_LINE_PATTERN.finditer(content):
+        section = match['section']
         
         # Section headers (comments)
-        if line.startswith('# ') and not line.startswith('##'):
-            section = line[2:].strip()
+        if section is not None:
             if section != current_section:
                 current_section = section
-                output.append(f"{Colors.BOLD}{Colors.YELLOW}{section}{Colors.RESET}")
-                output.append("")
+                output += b'\n'
+                write_styled(output, section_style, section)
+                output += b'\n'
         
         # Alias definitions
-        elif line.startswith('alias '):
-            try:
-                alias_def = line[6:]  # Remove 'alias '
-                if '=' in alias_def:
-                    alias_name, alias_cmd = alias_def.split('=', 1)
-                    alias_cmd = alias_cmd.strip('\'"')
-                    output.append(f"  {Colors.CYAN}{alias_name.strip():<15}{Colors.RESET} {alias_cmd}")
-            except:
-                continue
+        else:
+            output += b'\n  '
+            write_styled(output, alias_style, f"{match['name'].strip():<15}")
+            output += b' ' + match['command'].encode('utf-8')
+            if match['comment']:
+                output += match['comment'].encode('utf-8')
     
-    return '\n'.join(output)
+    return bytes(output)
+
 
+def print_styled(style: bytes, text: str):
+    """Write a single styled message line to stdout."""
+    line = bytearray()
+    write_styled(line, style, text)
+    line += b'\n'
+    sys.stdout.buffer.write(line)
+    sys.stdout.buffer.flush()
 
-def display_with_pager(content: str):
-    """Display content using system pager if available."""
+
+def write_output(chunks: Iterable[bytes]):
+    """Write content chunks to stdout as they are produced."""
+    # A 64 KiB buffer straight on the stdout file descriptor coalesces the
+    # chunks into few write() calls, with a single flush at the end
+    sys.stdout.flush()
     try:
-        # Try to use the system pager
-        pager = os.environ.get('PAGER', 'less')
-        if pager == 'less':
-            # Use less with some nice options
-            subprocess.run([pager, '-R', '-F', '-X'], input=content, text=True, check=True)
-        else:
-            subprocess.run([pager], input=content, text=True, check=True)
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        # Fall back to plain print
-        print(content)
+        with open(sys.stdout.fileno(), 'wb', buffering=65536, closefd=False) as out:
+            for chunk in chunks:
+                out.write(chunk)
+            out.write(b'\n')
+    except BrokenPipeError:
+        # The reading end went away early, e.g. when piped into head
+        pass
 
 
-def main():
+def _fits_on_screen(content: bytes) -> bool:
+    """Check whether content fits in the terminal height, if it is known."""
+    try:
+        lines = os.get_terminal_size(sys.stdout.fileno()).lines
+    except OSError:
+        return True
+    return content.count(b'\n') < lines
+
+
+def display_with_pager(chunks: Iterable[bytes]):
+    """Stream content through the system pager if available."""
+    chunks = iter(chunks)
+    first_chunk = next(chunks, b'')
+    
+    pager = os.environ.get('PAGER', 'less')
+    if pager == 'less':
+        # Use less with some nice options
+        command = [pager, '-R', '-F', '-X']
+        # With -F, less holds back the first page until it knows whether the
+        # input fits on one screen. Skip it once the first chunk alone won't.
+        if not _fits_on_screen(first_chunk):
+            command.remove('-F')
+    else:
+        command = [pager]
+    
+    try:
+        proc = subprocess.Popen(command, stdin=subprocess.PIPE)
+    except FileNotFoundError:
+        # Fall back to plain output
+        write_output(itertools.chain([first_chunk], chunks))
+        return
+    
+    # Feed the pager as chunks are formatted so it can start rendering early
+    try:
+        proc.stdin.write(first_chunk)
+        for chunk in chunks:
+            proc.stdin.write(chunk)
+        proc.stdin.close()
+    except BrokenPipeError:
+        # The user quit the pager before reading everything
+        pass
+    proc.wait()
+
+
+def read_files(files_to_show: List[Path]) -> Iterator[bytes]:
+    """Yield the content of each file in order, reading them in parallel."""
+    if len(files_to_show) == 1:
+        # Not worth importing and starting a thread pool for
+        yield read_file_bytes(files_to_show[0])
+        return
+    
+    from concurrent.futures import ThreadPoolExecutor
+    
+    with ThreadPoolExecutor(max_workers=min(8, len(files_to_show))) as executor:
+        yield from executor.map(read_file_bytes, files_to_show)
+
+
+def generate_output(files_to_show: List[Path], output_format: str) -> Iterator[bytes]:
+    """Yield the formatted output for each file, one file at a time."""
+    contents = read_files(files_to_show)
+    
+    for index, (file_path, content) in enumerate(zip(files_to_show, contents)):
+        if index:
+            yield b'\n\n'
+        
+        if output_format == 'html':
+            yield format_html(str(content, 'utf-8'), file_path).encode('utf-8')
+        elif output_format == 'text':
+            # The file's bytes are passed on as their own chunk, uncopied
+            yield f"=== {file_path.name} ===\n\n".encode('utf-8')
+            yield content
+        else:  # terminal
+            yield format_terminal(content, file_path)
+
+
+def parse_args_full(argv: List[str]):
+    """Parse command line arguments with argparse."""
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description='Display dotfiles documentation and information.',
         epilog='Examples:\n'
@@ -234,7 +454,40 @@ def main():
     parser.add_argument('--dir', help='Dotfiles directory (default: auto-detect)')
     parser.add_argument('--no-pager', action='store_true', help='Do not use pager for output')
     
-    args = parser.parse_args()
+    return parser.parse_args(argv)
+
+
+def parse_args(argv: List[str]):
+    """Parse command line arguments.
+    
+    The common invocations (no arguments, --aliases, --file NAME, --no-pager)
+    are recognized directly. Anything else, including --help and invalid
+    input, is handed to argparse.
+    """
+    args = SimpleNamespace(file=None, aliases=False, format='terminal', dir=None, no_pager=False)
+    
+    remaining = list(argv)
+    while remaining:
+        arg = remaining.pop(0)
+        if arg in ('--aliases', '-a'):
+            args.aliases = True
+        elif arg == '--no-pager':
+            args.no_pager = True
+        elif arg in ('--file', '-f') and remaining and not remaining[0].startswith('-'):
+            args.file = remaining.pop(0)
+        else:
+            return parse_args_full(argv)
+    
+    return args
+
+
+def main():
+    args = parse_args(sys.argv[1:])
+    
+    # Colors and paging are wasted when output is piped or redirected
+    if args.format == 'terminal' and not sys.stdout.isatty():
+        args.format = 'text'
+        args.no_pager = True
     
     # Set dotfiles directory
     if args.dir:
@@ -243,53 +496,40 @@ def main():
         dotfiles_dir = find_dotfiles_dir()
     
     if not dotfiles_dir.exists():
-        print(f"{Colors.RED}Error: Dotfiles directory not found: {dotfiles_dir}{Colors.RESET}")
+        print_styled(csi(*Colors.RED), f"Error: Dotfiles directory not found: {dotfiles_dir}")
         sys.exit(1)
     
     # Handle aliases display
     if args.aliases:
-        aliases_content = get_aliases()
+        aliases_content = get_aliases(args.format)
         if args.no_pager or args.format != 'terminal':
-            print(aliases_content)
+            write_output([aliases_content])
         else:
-            display_with_pager(aliases_content)
+            display_with_pager([aliases_content])
         return
     
     # Find files to display
     if args.file:
         file_path = dotfiles_dir / args.file
         if not file_path.exists():
-            print(f"{Colors.RED}Error: File not found: {file_path}{Colors.RESET}")
+            print_styled(csi(*Colors.RED), f"Error: File not found: {file_path}")
             sys.exit(1)
         files_to_show = [file_path]
     else:
         files_to_show = find_doc_files(dotfiles_dir)
         if not files_to_show:
-            print(f"{Colors.YELLOW}No documentation files found in {dotfiles_dir}{Colors.RESET}")
+            print_styled(csi(*Colors.YELLOW), f"No documentation files found in {dotfiles_dir}")
             sys.exit(1)
     
-    # Generate output
-    output_parts = []
-    
-    for file_path in files_to_show:
-        content = read_file(file_path)
-        
-        if args.format == 'html':
-            output_parts.append(format_html(content, file_path))
-        elif args.format == 'text':
-            output_parts.append(f"=== {file_path.name} ===\n\n{content}")
-        else:  # terminal
-            output_parts.append(format_terminal(content, file_path))
-    
     # Display output
-    final_output = '\n\n'.join(output_parts)
+    chunks = generate_output(files_to_show, args.format)
     
     if args.format == 'html':
-        print(final_output)
+        write_output(chunks)
     elif args.no_pager or args.format != 'terminal':
-        print(final_output)
+        write_output(chunks)
     else:
-        display_with_pager(final_output)
+        display_with_pager(chunks)
 
 
 if __name__ == '__main__':